@@ -1,12 +1,23 @@
 from datetime import datetime, timedelta
 
 class ExpiryManager:
-    def __init__(self):
-        self.holidays = self._load_holidays()
+    def __init__(self, kite_client=None, holiday_loader=None):
+        self.kite = kite_client
+        self.holiday_loader = holiday_loader
+        self._holidays = None
+
+    @property
+    def holidays(self):
+        """Holiday calendar, loaded on first use"""
+        if self._holidays is None:
+            self._holidays = self._load_holidays()
+        return self._holidays
 
     def _load_holidays(self):
         """Fetch exchange holidays from Zerodha API"""
         try:
+            if self.holiday_loader:
+                return self.holiday_loader()
             return self.kite.holidays()['NFO']  # Requires Kite Connect 3+
         except:
             # Fallback to static holidays if API fails
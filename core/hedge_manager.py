@@ -1,8 +1,12 @@
 class HedgeManager:
-    def __init__(self, kite_client, position_tracker):
+    def __init__(self, kite_client, position_tracker, order_slicer, expiry_manager=None,
+                 safeguards=None):
         self.kite = kite_client
         self.tracker = position_tracker
-        self.expiry_manager = ExpiryManager()
+        self.safeguards = safeguards
+        # Shared with OrderManager so hedges are polled, re-priced and budgeted
+        self.slicer = order_slicer
+        self.expiry_manager = expiry_manager or ExpiryManager(kite_client)
 
     def _get_avg_sell_premium(self, expiry, option_type):
         """Calculate average premium from executed sell orders"""
@@ -46,8 +50,24 @@ class HedgeManager:
         buy_qty = self.tracker.positions[expiry][option_type]['buy']['qty']
         return max(0, sell_qty - buy_qty)
 
+    def _log_stress(self, symbol, quantity):
+        """Stress the book with the hedge for the record; hedges are never blocked"""
+        if not self.safeguards:
+            return
+        try:
+            report = self.safeguards.evaluate_stress(symbol, quantity, "BUY")
+            if report:
+                print(f"Hedge stress for {symbol}: worst loss {report['worst_loss']:.0f}, "
+                      f"margin at risk {report['margin_at_risk']:.0%}")
+        except Exception as e:
+            print(f"Hedge stress check failed for {symbol}: {str(e)}")
+
     def _place_hedge_order(self, expiry, option_type, quantity):
-        """Complete order placement with validation"""
+        """Complete order placement with validation.
+
+        Returns the SlicedOrder worked by the shared slicer, or None if
+        nothing was placed.
+        """
         if quantity <= 0:
             return None
 
@@ -59,18 +79,18 @@ class HedgeManager:
             ltp_data = self.kite.ltp(f"NFO:{symbol}")
             ltp = ltp_data[f"NFO:{symbol}"]['last_price']
             
-            order_id = self.kite.place_order(
-                variety=self.kite.VARIETY_REGULAR,
-                exchange="NFO",
-                tradingsymbol=symbol,
-                transaction_type="BUY",
-                quantity=quantity,
-                product=TRADE_CONFIG['product_type'],
-                order_type=self.kite.ORDER_TYPE_LIMIT,
-                price=round(ltp * 1.05, 1)  # 5% above LTP
-            )
-            print(f"Hedge order placed: {order_id} for {symbol}")
-            return order_id
+            if quantity % TRADE_CONFIG['lot_size'] != 0:
+                raise Exception(f"Quantity {quantity} not multiple of lot size {TRADE_CONFIG['lot_size']}")
+
+            self._log_stress(symbol, quantity)
+            sliced = self.slicer.submit(symbol, "BUY", quantity,
+                                        TRADE_CONFIG['lot_size'], round(ltp * 1.05, 1))  # 5% above LTP
+            if not sliced.order_ids:
+                raise Exception(f"No child orders placed for {symbol}")
+            if sliced.rejected_quantity:
+                print(f"Hedge short {sliced.rejected_quantity}/{quantity} for {symbol}")
+            print(f"Hedge order placed: {sliced.order_ids} for {symbol}")
+            return sliced
         except Exception as e:
             print(f"Failed to place hedge: {str(e)}")
             return None
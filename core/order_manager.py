@@ -1,17 +1,36 @@
+from datetime import datetime
+
+from config.settings import TRADE_CONFIG
+from core.order_slicer import OrderSlicer
+
 class OrderManager:
-    def __init__(self, kite_client, safeguards):
+    def __init__(self, kite_client, safeguards, journal=None, instrument_lookup=None,
+                 order_slicer=None):
         self.kite = kite_client
         self.safeguards = safeguards
+        self.journal = journal
+        self.instrument_lookup = instrument_lookup
+        self.slicer = order_slicer or OrderSlicer(kite_client, safeguards)
         self.pending_orders = {}
 
+    def _lookup_instrument(self, symbol):
+        """Find instrument by symbol, via the warmed index when available"""
+        if self.instrument_lookup:
+            return self.instrument_lookup(symbol)
+        instruments = self.kite.instruments('NFO')
+        return next((i for i in instruments if i['tradingsymbol'] == symbol), None)
+
     def place_sell_order(self, symbol, quantity):
-        """Complete sell order with all validations"""
+        """Complete sell order with all validations.
+
+        Returns the SlicedOrder (one child within the freeze limit) that
+        `OrderSlicer.poll` works to completion, or None if nothing was placed.
+        """
         try:
-            self.safeguards.pre_trade_checks(symbol, quantity)
+            self.safeguards.pre_trade_checks(symbol, quantity, "SELL")
             
             # Get instrument token
-            instruments = self.kite.instruments('NFO')
-            instrument = next((i for i in instruments if i['tradingsymbol'] == symbol), None)
+            instrument = self._lookup_instrument(symbol)
             if not instrument:
                 raise Exception(f"Instrument {symbol} not found")
             
@@ -21,26 +40,24 @@ class OrderManager:
             
             # Place order
             ltp = self.kite.ltp(f"NFO:{symbol}")[f"NFO:{symbol}"]['last_price']
-            order_id = self.kite.place_order(
-                variety=self.kite.VARIETY_REGULAR,
-                exchange="NFO",
-                tradingsymbol=symbol,
-                transaction_type="SELL",
-                quantity=quantity,
-                product=TRADE_CONFIG['product_type'],
-                order_type=self.kite.ORDER_TYPE_LIMIT,
-                price=round(ltp * 0.95, 1),  # 5% below LTP
-                validity="DAY"
-            )
-            
-            self.pending_orders[order_id] = {
-                'symbol': symbol,
-                'quantity': quantity,
-                'timestamp': datetime.now()
-            }
-            
-            print(f"Sell order placed: {order_id} for {symbol}")
-            return order_id
+            limit_price = round(ltp * 0.95, 1)  # 5% below LTP
+            placed_at = datetime.now()  # stamped before the API round trip
+
+            sliced = self.slicer.submit(symbol, "SELL", quantity,
+                                        instrument['lot_size'], limit_price)
+            for child in sliced.children:
+                if child['order_id']:
+                    self._track(child['order_id'], symbol, child['quantity'],
+                                limit_price, placed_at)
+            if not sliced.order_ids:
+                raise Exception(f"No child orders placed for {symbol}")
+            if sliced.rejected_quantity:
+                # Partially placed: keep working what went out, but flag the shortfall
+                print(f"Sell order short {sliced.rejected_quantity}/{quantity} for {symbol}")
+                self.safeguards.record_error()
+
+            print(f"Sell order placed: {sliced.order_ids} for {symbol}")
+            return sliced
             
         except Exception as e:
             print(f"Sell order failed: {str(e)}")
@@ -84,6 +101,77 @@ class OrderManager:
             self.safeguards.record_error()
             return None
 
+    def _track(self, order_id, symbol, quantity, limit_price, placed_at):
+        """Register a placed sell order as pending; `sync_fills` journals it"""
+        self.pending_orders[order_id] = {
+            'symbol': symbol,
+            'quantity': quantity,
+            'price': limit_price,
+            'type': 'SELL',
+            'journaled': False,
+            'timestamp': placed_at
+        }
+
+    def _journal(self, order_id, status, price, quantity=None, timestamp=None):
+        """Record an order event for the latency/slippage analyzer.
+
+        Best-effort: a journal failure must never make a placed order look
+        failed to the caller.
+        """
+        if not self.journal:
+            return
+        details = self.pending_orders[order_id]
+        try:
+            self.journal.log_order({
+                'timestamp': timestamp or details['timestamp'],
+                'order_id': order_id,
+                'symbol': details['symbol'],
+                'type': details['type'],
+                'quantity': quantity or details['quantity'],
+                'price': price,
+                'status': status
+            })
+        except Exception as e:
+            print(f"Journal write failed for {order_id}: {str(e)}")
+
+    def _placement_time(self, order_id):
+        """Broker time the order was received: the first entry of its history"""
+        history = self.kite.order_history(order_id)
+        return history[0]['order_timestamp']
+
+    def sync_fills(self, orders=None):
+        """Journal entry orders from the broker's orderbook (fetched if None).
+
+        Placement (PENDING, at the limit price) and fill (COMPLETE, at the
+        average price) rows are both stamped with broker timestamps, so
+        placed-to-fill latency is measured on one clock. An orderbook
+        entry's `order_timestamp` is its latest state change, so the
+        placement time comes from the order's history instead.
+        """
+        if orders is None:
+            orders = self.kite.orders()
+        filled = 0
+        for order in orders:
+            order_id = order['order_id']
+            details = self.pending_orders.get(order_id)
+            if not details or details.get('is_sl'):
+                continue
+            if not details['journaled']:
+                try:
+                    placed_at = self._placement_time(order_id)
+                except Exception as e:
+                    # Retry next cycle rather than journal a fill without its placement
+                    print(f"Order history unavailable for {order_id}: {str(e)}")
+                    continue
+                self._journal(order_id, 'PENDING', details['price'], timestamp=placed_at)
+                details['journaled'] = True
+            if order['status'] == 'COMPLETE':
+                self._journal(order_id, 'COMPLETE', order['average_price'],
+                              order['filled_quantity'], order.get('exchange_timestamp'))
+                del self.pending_orders[order_id]
+                filled += 1
+        return filled
+
     def cancel_stale_orders(self, timeout_minutes=30):
         """Cancel orders pending too long"""
         now = datetime.now()
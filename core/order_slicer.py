@@ -0,0 +1,234 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from config.settings import TRADE_CONFIG
+
+NIFTY_FREEZE_QUANTITY = 1800  # Max units per NFO order, exchange-imposed
+MAX_REPRICE_DEVIATION = 0.05  # Re-prices stay within 5% of the original limit
+TERMINAL_STATUSES = ('COMPLETE', 'CANCELLED', 'REJECTED')
+
+
+class RateLimiter:
+    """Thread-safe spacing of calls to at most `per_second` per second"""
+
+    def __init__(self, per_second):
+        self.interval = 1.0 / per_second
+        self.next_slot = 0.0
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class SlicedOrder:
+    """Parent order split into freeze-compliant child orders"""
+
+    def __init__(self, symbol, transaction_type, quantity, limit_price):
+        self.symbol = symbol
+        self.transaction_type = transaction_type
+        self.quantity = quantity
+        self.limit_price = limit_price
+        self.children = []
+        self.created = datetime.now()
+
+    @property
+    def order_ids(self):
+        return [c['order_id'] for c in self.children if c['order_id']]
+
+    @property
+    def filled_quantity(self):
+        return sum(c['filled_quantity'] for c in self.children)
+
+    @property
+    def vwap(self):
+        """Volume-weighted average fill price across all children"""
+        filled = self.filled_quantity
+        if not filled:
+            return 0.0
+        return sum(c['average_price'] * c['filled_quantity'] for c in self.children) / filled
+
+    @property
+    def rejected_quantity(self):
+        """Quantity whose child orders could not be placed"""
+        return sum(c['quantity'] for c in self.children if not c['order_id'])
+
+    @property
+    def done(self):
+        return all(c['status'] in TERMINAL_STATUSES for c in self.children)
+
+
+class OrderSlicer:
+    """Split large orders under the freeze quantity and work them concurrently"""
+
+    def __init__(self, kite_client, safeguards=None, freeze_quantity=None,
+                 orders_per_second=None, max_workers=4):
+        self.kite = kite_client
+        self.safeguards = safeguards
+        self.freeze_quantity = freeze_quantity or TRADE_CONFIG.get('freeze_quantity', NIFTY_FREEZE_QUANTITY)
+        self.max_deviation = TRADE_CONFIG.get('max_reprice_deviation', MAX_REPRICE_DEVIATION)
+        self.limiter = RateLimiter(orders_per_second or TRADE_CONFIG.get('orders_per_second', 10))
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='slicer')
+        self.active = []
+
+    def slice_quantity(self, quantity, lot_size):
+        """Split into the fewest near-equal lot multiples under the freeze limit"""
+        if quantity % lot_size != 0:
+            raise Exception(f"Quantity {quantity} not multiple of lot size {lot_size}")
+        lots = quantity // lot_size
+        max_lots = max(1, self.freeze_quantity // lot_size)
+        slices = -(-lots // max_lots)  # ceil
+        base, extra = divmod(lots, slices) if slices else (0, 0)
+        return [(base + (1 if i < extra else 0)) * lot_size for i in range(slices)]
+
+    def _quote_price(self, sliced):
+        """Best opposite-side price from the live book, bounded around the original limit"""
+        key = f"NFO:{sliced.symbol}"
+        quote = self.kite.quote(key)[key]
+        side = 'sell' if sliced.transaction_type == 'BUY' else 'buy'
+        levels = [lvl for lvl in quote['depth'][side] if lvl['price'] > 0]
+        price = levels[0]['price'] if levels else quote['last_price']
+
+        if sliced.transaction_type == 'BUY':
+            return min(price, round(sliced.limit_price * (1 + self.max_deviation), 1))
+        return max(price, round(sliced.limit_price * (1 - self.max_deviation), 1))
+
+    def _place_child(self, sliced, child):
+        self.limiter.acquire()
+        try:
+            child['order_id'] = self.kite.place_order(
+                variety=self.kite.VARIETY_REGULAR,
+                exchange="NFO",
+                tradingsymbol=sliced.symbol,
+                transaction_type=sliced.transaction_type,
+                quantity=child['quantity'],
+                product=TRADE_CONFIG['product_type'],
+                order_type=self.kite.ORDER_TYPE_LIMIT,
+                price=child['price'],
+                validity="DAY"
+            )
+            child['status'] = 'OPEN'
+            child['priced_at'] = time.monotonic()
+        except Exception as e:
+            child['status'] = 'REJECTED'
+            child['error'] = str(e)
+            print(f"Child order failed for {sliced.symbol}: {str(e)}")
+        return child
+
+    def _place_children(self, sliced, children):
+        # Children count against the safeguards' per-minute order budget
+        if self.safeguards:
+            self.safeguards.reserve_orders(len(children))
+        list(self.executor.map(lambda c: self._place_child(sliced, c), children))
+
+    def submit(self, symbol, transaction_type, quantity, lot_size, price):
+        """Place all child orders concurrently at the given limit price.
+
+        Quantities within the freeze limit go out as a single child, so every
+        order is a SlicedOrder. Children that fail to place are retried once;
+        any still unplaced show up in `rejected_quantity`. The returned order
+        is registered with `poll`, which tracks its fills and re-prices
+        resting children on every call.
+        """
+        sliced = SlicedOrder(symbol, transaction_type, quantity, price)
+        sliced.children = [{
+            'order_id': None,
+            'quantity': qty,
+            'price': price,
+            'status': 'PENDING',
+            'filled_quantity': 0,
+            'average_price': 0.0,
+            'priced_at': None
+        } for qty in self.slice_quantity(quantity, lot_size)]
+
+        self._place_children(sliced, sliced.children)
+        rejected = [c for c in sliced.children if not c['order_id']]
+        if rejected:
+            for child in rejected:
+                child['status'] = 'PENDING'
+            self._place_children(sliced, rejected)
+        print(f"Sliced {transaction_type} {quantity} {symbol} into "
+              f"{len(sliced.order_ids)}/{len(sliced.children)} child orders")
+        if sliced.order_ids:
+            self.active.append(sliced)
+        return sliced
+
+    def working_legs(self):
+        """Unfilled quantity of live children as (symbol, signed_qty) legs.
+
+        Reflects the last `poll`; a child filled since then may briefly be
+        counted both here and in net positions, which errs on the safe side.
+        """
+        legs = {}
+        for sliced in list(self.active):
+            sign = -1 if sliced.transaction_type == 'SELL' else 1
+            for child in sliced.children:
+                if child['order_id'] and child['status'] not in TERMINAL_STATUSES:
+                    remaining = child['quantity'] - child['filled_quantity']
+                    legs[sliced.symbol] = legs.get(sliced.symbol, 0) + sign * remaining
+        return [(symbol, qty) for symbol, qty in legs.items() if qty]
+
+    def _apply_orderbook(self, sliced, orders):
+        """Update child fills from an orderbook keyed by order_id"""
+        for child in sliced.children:
+            order = orders.get(child['order_id'])
+            if order:
+                child['status'] = order['status']
+                child['filled_quantity'] = order['filled_quantity']
+                child['average_price'] = order['average_price']
+        return sliced
+
+    def _reprice(self, sliced, child, price):
+        self.limiter.acquire()
+        try:
+            self.kite.modify_order(
+                variety=self.kite.VARIETY_REGULAR,
+                order_id=child['order_id'],
+                price=price
+            )
+            child['price'] = price
+            child['priced_at'] = time.monotonic()
+        except Exception as e:
+            print(f"Reprice failed for {child['order_id']}: {str(e)}")
+
+    def poll(self, orders=None, reprice_after=3):
+        """Non-blocking pass over all active sliced orders.
+
+        One orderbook (passed in, or fetched if None) refreshes every
+        child's fill; children resting longer than `reprice_after` seconds
+        are moved to the bounded live quote. Returns the sliced orders that
+        finished in this pass.
+        """
+        if not self.active:
+            return []
+
+        if orders is None:
+            orders = self.kite.orders()
+        orders = {o['order_id']: o for o in orders}
+        finished = []
+        for sliced in list(self.active):
+            self._apply_orderbook(sliced, orders)
+            if sliced.done:
+                self.active.remove(sliced)
+                finished.append(sliced)
+                print(f"{sliced.symbol}: filled {sliced.filled_quantity}/{sliced.quantity} "
+                      f"@ VWAP {sliced.vwap:.2f}")
+                continue
+
+            stale = [c for c in sliced.children
+                     if c['status'] == 'OPEN' and
+                     time.monotonic() - c['priced_at'] >= reprice_after]
+            if stale:
+                price = self._quote_price(sliced)
+                stale = [c for c in stale if c['price'] != price]
+                list(self.executor.map(lambda c: self._reprice(sliced, c, price), stale))
+        return finished
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False)
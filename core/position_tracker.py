@@ -1,19 +1,26 @@
+import time
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 class PositionTracker:
-    def __init__(self, kite_client):
+    def __init__(self, kite_client, instrument_lookup=None, history_workers=4):
         self.kite = kite_client
+        self.instrument_lookup = instrument_lookup
+        self.history_workers = history_workers
+        self.last_refresh = None
         self.positions = defaultdict(lambda: {'CE': {'sell': {'qty': 0, 'avg_price': 0},
                                               'buy': {'qty': 0, 'avg_price': 0}},
                                     'PE': {'sell': {'qty': 0, 'avg_price': 0},
-                                           'buy': {'qty': 0, 'avg_price': 0}})
+                                           'buy': {'qty': 0, 'avg_price': 0}}})
         self.order_history_cache = {}
 
-    def refresh_positions(self):
+    def refresh_positions(self, positions=None, orders=None):
         """Sync with broker positions and calculate averages"""
-        positions = self.kite.positions()['net']
-        orders = self.kite.orders()
+        if positions is None:
+            positions = self.kite.positions()['net']
+        if orders is None:
+            orders = self.kite.orders()
         
         # Clear existing data
         self.positions.clear()
@@ -28,14 +35,25 @@ class PositionTracker:
                 
                 self.positions[expiry][option_type][direction]['qty'] = abs(p['quantity'])
                 self.positions[expiry][option_type][direction]['avg_price'] = p['average_price']
+                self.positions[expiry][option_type][direction]['symbol'] = p['tradingsymbol']
+
+        self.last_refresh = time.monotonic()
 
     def _cache_order_history(self, orders):
-        """Cache order history for premium calculation"""
-        self.order_history_cache = {}
-        for order in orders:
-            if order['status'] == 'COMPLETE' and order['product'] == 'OPT':
-                history = self.kite.order_history(order['order_id'])
-                self.order_history_cache[order['order_id']] = history[-1]  # Last execution
+        """Cache order history for premium calculation.
+
+        Completed orders never change, so only ids not already cached are
+        fetched, in parallel.
+        """
+        completed = [o['order_id'] for o in orders
+                     if o['status'] == 'COMPLETE' and o['product'] == 'OPT']
+        missing = [oid for oid in completed if oid not in self.order_history_cache]
+        if missing:
+            with ThreadPoolExecutor(max_workers=self.history_workers) as pool:
+                histories = pool.map(self.kite.order_history, missing)
+                for order_id, history in zip(missing, histories):
+                    self.order_history_cache[order_id] = history[-1]  # Last execution
+        self.order_history_cache = {oid: self.order_history_cache[oid] for oid in completed}
 
     def _get_avg_sell_price(self, expiry, option_type):
         """Calculate average sell price from executed orders"""
@@ -45,7 +63,7 @@ class PositionTracker:
         for order_id, execution in self.order_history_cache.items():
             if (execution['tradingsymbol'].endswith(option_type) and \
                (expiry in execution['tradingsymbol']) and \
-               (execution['transaction_type'] == 'SELL'):
+               (execution['transaction_type'] == 'SELL')):
                 total_value += execution['average_price'] * execution['filled_quantity']
                 total_quantity += execution['filled_quantity']
         
@@ -53,27 +71,31 @@ class PositionTracker:
 
     def _get_ltp(self, expiry, option_type):
         """Get last traded price for given option"""
-        instruments = self.kite.instruments('NFO')
-        symbol = next((i['tradingsymbol'] for i in instruments 
-                     if i['expiry'] == expiry and 
-                     i['instrument_type'] == option_type), None)
-        
+        symbol = self._get_symbol(expiry, option_type)
         if symbol:
             return self.kite.ltp(f"NFO:{symbol}")[f"NFO:{symbol}"]['last_price']
         return 0
 
     def _get_strike(self, expiry, option_type):
-        """Extract strike price from symbol"""
-        positions = self.kite.positions()['net']
-        for p in positions:
-            if p['expiry'] == expiry and option_type in p['tradingsymbol']:
-                return int(p['tradingsymbol'].split(option_type)[0][-5:])
-        return 0
+        """Strike from the instrument index, else parsed from the symbol"""
+        symbol = self._get_symbol(expiry, option_type)
+        if not symbol:
+            return 0
+        if self.instrument_lookup:
+            instrument = self.instrument_lookup(symbol)
+            if instrument:
+                return int(instrument['strike'])
+        return int(symbol.split(option_type)[0][-5:])
 
-    def get_profitable_legs(self, profit_threshold):
-        """Enhanced with proper average price calculation"""
+    def get_profitable_legs(self, profit_threshold, max_age=5):
+        """Enhanced with proper average price calculation.
+
+        Positions are only re-fetched if older than `max_age` seconds, so
+        the loop's own refresh (or the startup seed) is reused.
+        """
         profitable = []
-        self.refresh_positions()
+        if self.last_refresh is None or time.monotonic() - self.last_refresh > max_age:
+            self.refresh_positions()
         
         for expiry in list(self.positions.keys()):
             for option_type in ['CE', 'PE']:
@@ -96,9 +118,6 @@ class PositionTracker:
         return profitable
 
     def _get_symbol(self, expiry, option_type):
-        """Generate symbol from existing positions"""
-        positions = self.kite.positions()['net']
-        for p in positions:
-            if p['expiry'] == expiry and option_type in p['tradingsymbol']:
-                return p['tradingsymbol']
-        return None
+        """Symbol recorded for the position at the last refresh"""
+        legs = self.positions[expiry][option_type]
+        return legs['sell'].get('symbol') or legs['buy'].get('symbol')
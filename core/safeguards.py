@@ -1,11 +1,27 @@
 import time
 from datetime import datetime, timedelta
 
+from config.settings import TRADE_CONFIG
+
 class TradingSafeguards:
-    def __init__(self, kite_client):
+    MAX_ORDERS_PER_MINUTE = 30
+    MAX_MARGIN_AT_RISK = 1.0  # worst stress scenario must not exceed total capital
+
+    def __init__(self, kite_client, instrument_lookup=None, stress_engine=None):
         self.kite = kite_client
+        self.instrument_lookup = instrument_lookup
+        self.stress_engine = stress_engine
+        self.last_stress = None
         self.last_order_time = None
         self.order_count = 0
+        self.order_minute = None
+
+    def _lookup_instrument(self, symbol):
+        """Find instrument by symbol, via the warmed index when available"""
+        if self.instrument_lookup:
+            return self.instrument_lookup(symbol)
+        instruments = self.kite.instruments('NFO')
+        return next((i for i in instruments if i['tradingsymbol'] == symbol), None)
         
     def check_market_hours(self):
         """Ensure trading is only during market hours"""
@@ -21,12 +37,29 @@ class TradingSafeguards:
         if self.last_order_time and (time.time() - self.last_order_time < 2):
             time.sleep(2 - (time.time() - self.last_order_time))
             
-        if self.order_count >= 30:
+        if self.order_count >= self.MAX_ORDERS_PER_MINUTE:
             current_minute = datetime.now().minute
             while datetime.now().minute == current_minute:
                 time.sleep(1)
             self.order_count = 0
             
+    def reserve_orders(self, count=1):
+        """Count orders against the per-minute budget, waiting for the next minute if full"""
+        if count > self.MAX_ORDERS_PER_MINUTE:
+            raise Exception(f"{count} orders exceed the {self.MAX_ORDERS_PER_MINUTE}/min budget")
+
+        minute = datetime.now().replace(second=0, microsecond=0)
+        if minute != self.order_minute:
+            self.order_minute, self.order_count = minute, 0
+        if self.order_count + count > self.MAX_ORDERS_PER_MINUTE:
+            while datetime.now().replace(second=0, microsecond=0) == minute:
+                time.sleep(1)
+            self.order_minute = datetime.now().replace(second=0, microsecond=0)
+            self.order_count = 0
+
+        self.order_count += count
+        self.last_order_time = time.time()
+
     def validate_liquidity(self, symbol, quantity):
         """Check order book depth before trading"""
         depth = self.kite.quote(symbol)['depth']
@@ -37,15 +70,49 @@ class TradingSafeguards:
             
     def check_corporate_action(self, symbol):
         """Verify no corporate action is pending"""
-        instruments = self.kite.instruments('NFO')
-        instrument = next((i for i in instruments if i['tradingsymbol'] == symbol), None)
+        instrument = self._lookup_instrument(symbol)
         
         if instrument and instrument['lot_size'] != TRADE_CONFIG['lot_size']:
             raise Exception("Corporate action detected - lot size changed")
             
-    def pre_trade_checks(self, symbol, quantity):
+    def _stress_limits(self):
+        max_loss = TRADE_CONFIG.get('max_stress_loss')
+        # Distinct from RM-04's SPAN utilisation limit: this includes the stressed loss
+        at_risk_limit = TRADE_CONFIG.get('max_margin_at_risk', self.MAX_MARGIN_AT_RISK)
+        return max_loss, at_risk_limit
+
+    def evaluate_stress(self, symbol, quantity, transaction_type):
+        """Stress the book with the proposed order and keep the report in `last_stress`.
+
+        Returns None without any broker call when there is no engine or
+        both limits are set to None in TRADE_CONFIG.
+        """
+        if not self.stress_engine or self._stress_limits() == (None, None):
+            return None
+        signed_qty = -quantity if transaction_type == 'SELL' else quantity
+        self.last_stress = self.stress_engine.run(extra_legs=[(symbol, signed_qty)])
+        return self.last_stress
+
+    def check_stress(self, symbol, quantity, transaction_type):
+        """Reject orders whose post-trade book fails the scenario stress test"""
+        report = self.evaluate_stress(symbol, quantity, transaction_type)
+        if report is None:
+            return
+        max_loss, at_risk_limit = self._stress_limits()
+
+        if max_loss is not None and report['worst_loss'] > max_loss:
+            raise Exception(f"Stress loss {report['worst_loss']:.0f} exceeds "
+                            f"limit {max_loss} at {report['worst_scenario']}")
+
+        if at_risk_limit is not None and report['margin_at_risk'] > at_risk_limit:
+            raise Exception(f"Margin at risk {report['margin_at_risk']:.0%} "
+                            f"exceeds limit {at_risk_limit:.0%}")
+
+    def pre_trade_checks(self, symbol, quantity, transaction_type=None):
         """Run all validations before order placement"""
         self.check_market_hours()
         self.enforce_rate_limit()
         self.validate_liquidity(symbol, quantity)
         self.check_corporate_action(symbol)
+        if transaction_type == 'SELL':
+            self.check_stress(symbol, quantity, transaction_type)
@@ -0,0 +1,139 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+
+class StartupSequencer:
+    """Warm broker state concurrently and gate the trading loop on readiness"""
+
+    DEFAULT_REQUIRED = ('positions', 'orders')
+
+    def __init__(self, kite_client, logger, required=None, max_workers=5):
+        self.kite = kite_client
+        self.logger = logger
+        self.required = tuple(required or self.DEFAULT_REQUIRED)
+        self.timings = {}
+        self.futures = {}
+        self.completed_at = {}
+        self.instrument_index = None
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix='warmup')
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+        self._consumed = set()
+        self._started = None
+        self.seeded = False
+
+    @contextmanager
+    def phase(self, name):
+        """Time a synchronous startup phase"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._record(name, time.perf_counter() - start)
+
+    def _record(self, name, elapsed):
+        with self._lock:
+            self.timings[name] = elapsed
+        self.logger.info(f"Startup phase '{name}' took {elapsed * 1000:.0f} ms")
+
+    def _tasks(self):
+        """Broker calls warmed in the background, keyed by state name"""
+        return {
+            'positions': lambda: self.kite.positions()['net'],
+            'orders': self.kite.orders,
+            'margins': self.kite.margins,
+            'holidays': lambda: self.kite.holidays()['NFO'],
+            'instruments': self._load_instruments,
+        }
+
+    def _load_instruments(self):
+        """Download NFO instruments and index them by trading symbol"""
+        instruments = self.kite.instruments('NFO')
+        self.instrument_index = {i['tradingsymbol']: i for i in instruments}
+        return instruments
+
+    def _run(self, name, task):
+        start = time.perf_counter()
+        try:
+            return task()
+        finally:
+            self.completed_at[name] = time.monotonic()
+            self._record(name, time.perf_counter() - start)
+
+    def _on_done(self, _future):
+        if all(name in self.futures and self.futures[name].done()
+               for name in self.required):
+            if not self._ready.is_set():
+                self._record('ready', time.perf_counter() - self._started)
+                self._ready.set()
+
+    def warm(self):
+        """Submit every warm-up task without waiting for any of them"""
+        self._started = time.perf_counter()
+        for name, task in self._tasks().items():
+            self.futures[name] = self._executor.submit(self._run, name, task)
+        for name in self.required:
+            self.futures[name].add_done_callback(self._on_done)
+        return self
+
+    def wait_until_ready(self, timeout=None):
+        """Block until the minimum state for the first cycle is available"""
+        ready = self._ready.wait(timeout)
+        if not ready:
+            pending = [n for n in self.required if not self.futures[n].done()]
+            self.logger.warning(f"Startup not ready after {timeout}s, pending: {pending}")
+        return ready
+
+    def get(self, name, timeout=None):
+        """Result of a warm-up task, waiting for it if still in flight"""
+        return self.futures[name].result(timeout)
+
+    def failed(self, *names):
+        """Names of finished warm-up tasks that raised"""
+        return [n for n in names
+                if self.futures[n].done() and self.futures[n].exception() is not None]
+
+    def take(self, name, fallback, max_age):
+        """Warmed result once, if no older than `max_age` seconds; else `fallback()`"""
+        with self._lock:
+            fresh = name not in self._consumed
+            self._consumed.add(name)
+        if (fresh and self.futures[name].done() and not self.failed(name) and
+                time.monotonic() - self.completed_at[name] <= max_age):
+            return self.futures[name].result()
+        return fallback()
+
+    def lookup_instrument(self, symbol):
+        """Instrument record for symbol from the warmed index"""
+        try:
+            self.get('instruments')
+        except Exception:
+            # Warm-up download failed; retry it live, once per caller wave
+            with self._lock:
+                if self.instrument_index is None:
+                    self._load_instruments()
+        return self.instrument_index.get(symbol)
+
+    def pending(self):
+        """Warm-up tasks still in flight"""
+        return [name for name, future in self.futures.items() if not future.done()]
+
+    def report(self):
+        """Log a one-line summary of all recorded phase timings.
+
+        Tasks outside the readiness gate (e.g. instruments) may still be in
+        flight; they are listed so a slow first order can be attributed.
+        """
+        summary = ', '.join(f"{name}={elapsed * 1000:.0f}ms"
+                            for name, elapsed in self.timings.items())
+        pending = self.pending()
+        if pending:
+            summary += f" | still warming: {', '.join(pending)}"
+        self.logger.info(f"Startup timings | {summary}")
+        return dict(self.timings)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
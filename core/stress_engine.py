@@ -0,0 +1,185 @@
+from datetime import datetime, time as dtime
+
+import numpy as np
+
+from config.settings import TRADE_CONFIG
+
+SPOT_SYMBOL = "NSE:NIFTY 50"
+# Sized to NIFTY's worst single sessions (about -6% outside 2020) plus an IV
+# spike; wider grids put a one-lot straddle beyond a typical account's capital
+SPOT_MOVES = np.linspace(-0.06, 0.06, 49)     # -6% .. +6% in 0.25% steps
+VOL_SHOCKS = np.linspace(-0.05, 0.10, 16)     # absolute IV change, -5 .. +10 vol pts
+DAYS_FORWARD = np.array([0, 1, 2])            # calendar days of decay, e.g. a weekend
+MIN_VOL = 0.01
+MIN_TIME = 1e-6  # years; below this an option is valued at intrinsic
+
+
+def _norm_cdf(x):
+    """Standard normal CDF via Abramowitz-Stegun 7.1.26 (|error| < 1.5e-7)"""
+    z = np.abs(x) / np.sqrt(2.0)
+    t = 1.0 / (1.0 + 0.3275911 * z)
+    poly = t * (0.254829592 + t * (-0.284496736 + t * (1.421413741 +
+                t * (-1.453152027 + t * 1.061405429))))
+    erf = 1.0 - poly * np.exp(-z * z)
+    return 0.5 * (1.0 + np.sign(x) * erf)
+
+
+def black_scholes(spot, strike, t, vol, rate, is_call):
+    """European option value; all arguments broadcast against each other"""
+    t_safe = np.maximum(t, MIN_TIME)
+    sqrt_t = np.sqrt(t_safe)
+    d1 = (np.log(spot / strike) + (rate + 0.5 * vol ** 2) * t_safe) / (vol * sqrt_t)
+    d2 = d1 - vol * sqrt_t
+    discount = np.exp(-rate * t_safe)
+    call = spot * _norm_cdf(d1) - strike * discount * _norm_cdf(d2)
+    put = strike * discount * _norm_cdf(-d2) - spot * _norm_cdf(-d1)
+    value = np.where(is_call, call, put)
+    intrinsic = np.where(is_call, np.maximum(spot - strike, 0.0),
+                         np.maximum(strike - spot, 0.0))
+    return np.where(t <= MIN_TIME, intrinsic, value)
+
+
+def implied_vol(price, spot, strike, t, rate, is_call, iterations=60):
+    """Vectorised bisection for the volatility that reproduces `price`"""
+    low = np.full(np.shape(price), MIN_VOL)
+    high = np.full(np.shape(price), 3.0)
+    for _ in range(iterations):
+        mid = 0.5 * (low + high)
+        above = black_scholes(spot, strike, t, mid, rate, is_call) > price
+        high = np.where(above, mid, high)
+        low = np.where(above, low, mid)
+    return 0.5 * (low + high)
+
+
+class StressEngine:
+    """Revalue the whole option book across a spot x vol x time scenario grid"""
+
+    def __init__(self, kite_client, instrument_lookup, spot_moves=SPOT_MOVES,
+                 vol_shocks=VOL_SHOCKS, days_forward=DAYS_FORWARD, margin_loader=None,
+                 working_orders=None):
+        self.kite = kite_client
+        self.lookup_instrument = instrument_lookup
+        self.load_margins = margin_loader or kite_client.margins
+        # Callable returning (symbol, signed_qty) for orders placed but not yet filled
+        self.working_orders = working_orders
+        self.rate = TRADE_CONFIG.get('risk_free_rate', 0.065)
+        self.spot_moves = np.asarray(spot_moves, dtype=float)
+        self.vol_shocks = np.asarray(vol_shocks, dtype=float)
+        self.days_forward = np.asarray(days_forward, dtype=float)
+
+    @property
+    def scenario_count(self):
+        return self.spot_moves.size * self.vol_shocks.size * self.days_forward.size
+
+    def build_book(self, extra_legs=()):
+        """Positions, working orders and proposed (symbol, signed_qty) legs as arrays.
+
+        Working orders count as filled, so the first leg of a straddle is in
+        the book while the second is checked. An existing position missing
+        from the LTP response is valued at the position's own last price;
+        any other leg without a quote raises.
+        """
+        legs = [(p['tradingsymbol'], p['quantity'], p.get('last_price'))
+                for p in self.kite.positions()['net']
+                if p['exchange'] == 'NFO' and p['quantity'] != 0]
+        if self.working_orders:
+            legs.extend((symbol, quantity, None) for symbol, quantity in self.working_orders())
+        legs.extend((symbol, quantity, None) for symbol, quantity in extra_legs)
+        if not legs:
+            return None
+
+        keys = [f"NFO:{symbol}" for symbol, _, _ in legs]
+        quotes = self.kite.ltp(keys + [SPOT_SYMBOL])
+        now = datetime.now()
+
+        proposed = {symbol for symbol, _ in extra_legs}
+        strikes, times, is_call, qty, prices = [], [], [], [], []
+        for (symbol, quantity, last_price), key in zip(legs, keys):
+            instrument = self.lookup_instrument(symbol)
+            if not instrument or instrument['instrument_type'] not in ('CE', 'PE'):
+                if symbol in proposed:
+                    raise Exception(f"Cannot stress proposed leg {symbol}: not an NFO option")
+                continue
+            price = quotes[key]['last_price'] if key in quotes else last_price
+            if not price:
+                raise Exception(f"Cannot stress {symbol}: no price available")
+            expiry = datetime.combine(instrument['expiry'], dtime(15, 30))
+            strikes.append(instrument['strike'])
+            times.append(max((expiry - now).total_seconds(), 0) / (365 * 86400))
+            is_call.append(instrument['instrument_type'] == 'CE')
+            qty.append(quantity)
+            prices.append(price)
+        if not strikes:
+            return None
+
+        book = {
+            'spot': quotes[SPOT_SYMBOL]['last_price'],
+            'strike': np.array(strikes, dtype=float),
+            't': np.array(times, dtype=float),
+            'is_call': np.array(is_call, dtype=bool),
+            'qty': np.array(qty, dtype=float),
+            'price': np.array(prices, dtype=float),
+        }
+        book['vol'] = implied_vol(book['price'], book['spot'], book['strike'],
+                                  book['t'], self.rate, book['is_call'])
+        return book
+
+    def revalue(self, book):
+        """P&L grid of shape (days, vol shocks, spot moves) in one broadcast pass"""
+        # Axes (days D, vol V, spot S, legs L): spot (1,1,S,1), vol (1,V,1,L), t (D,1,1,L)
+        spot = book['spot'] * (1.0 + self.spot_moves)[None, None, :, None]
+        vol = np.maximum(book['vol'] + self.vol_shocks[None, :, None, None], MIN_VOL)
+        t = np.maximum(book['t'] - self.days_forward[:, None, None, None] / 365.0, 0.0)
+
+        values = black_scholes(spot, book['strike'], t, vol, self.rate, book['is_call'])
+        return ((values - book['price']) * book['qty']).sum(axis=-1)
+
+    def order_margin(self, extra_legs):
+        """Margin the proposed legs would block, from the broker's margin calculator"""
+        if not extra_legs:
+            return 0.0
+        params = [{
+            'exchange': 'NFO',
+            'tradingsymbol': symbol,
+            'transaction_type': 'SELL' if quantity < 0 else 'BUY',
+            'variety': self.kite.VARIETY_REGULAR,
+            'product': TRADE_CONFIG['product_type'],
+            'order_type': self.kite.ORDER_TYPE_MARKET,
+            'quantity': abs(quantity),
+            'price': 0
+        } for symbol, quantity in extra_legs]
+        return float(sum(m['total'] for m in self.kite.order_margins(params)))
+
+    def run(self, extra_legs=()):
+        """Worst-case loss and margin-at-risk for the book plus any proposed legs.
+
+        Margin-at-risk is (used margin + margin blocked by the proposed legs
+        + worst-case loss) over total margin: the share of capital consumed
+        if the worst scenario hits right after the order fills.
+        """
+        book = self.build_book(extra_legs)
+        if book is None:
+            return {'worst_loss': 0.0, 'margin_at_risk': 0.0, 'order_margin': 0.0,
+                    'worst_scenario': None, 'pnl': None}
+
+        pnl = self.revalue(book)
+        d, v, s = np.unravel_index(np.argmin(pnl), pnl.shape)
+        worst_loss = max(0.0, -float(pnl[d, v, s]))
+
+        margin = self.load_margins()['equity']
+        order_margin = self.order_margin(extra_legs)
+        capacity = margin['used'] + margin['available']
+        at_risk = margin['used'] + order_margin + worst_loss
+        margin_at_risk = at_risk / capacity if capacity > 0 else float('inf')
+
+        return {
+            'worst_loss': worst_loss,
+            'margin_at_risk': margin_at_risk,
+            'order_margin': order_margin,
+            'worst_scenario': {
+                'spot_move': float(self.spot_moves[s]),
+                'vol_shock': float(self.vol_shocks[v]),
+                'days_forward': float(self.days_forward[d]),
+            },
+            'pnl': pnl,
+        }
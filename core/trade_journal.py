@@ -29,7 +29,7 @@ class TradeJournal:
             with open(self.journal_file, 'a', newline='') as f:
                 writer = csv.writer(f)
                 writer.writerow([
-                    datetime.now().isoformat(),
+                    (order_data.get('timestamp') or datetime.now()).isoformat(),
                     order_data.get('order_id', 'N/A'),
                     order_data.get('symbol', 'N/A'),
                     order_data.get('type', 'N/A'),
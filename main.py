@@ -2,43 +2,86 @@
 import logging
 from config.settings import API_CREDENTIALS, TRADE_CONFIG
 from utils.logger import configure_logger
-from core.trade_manager import TradeManager
-from core.position_tracker import PositionTracker
-from core.hedge_manager import HedgeManager
-from core.order_manager import OrderManager
-from core.safeguards import TradingSafeguards
-from core.trade_journal import TradeJournal
-from kiteconnect import KiteConnect
+from core.startup import StartupSequencer
+
+STARTUP_READY_TIMEOUT = 2  # seconds
 
 def initialize_components():
-    """Initialize all system components with dependency injection"""
+    """Initialize all system components with dependency injection.
+
+    Returns the trade manager and the startup sequencer that warmed it.
+    """
     logger = configure_logger('main')
     
     try:
-        # Initialize Kite Connect
+        # Initialize Kite Connect (imported lazily, it pulls in the HTTP stack)
+        from kiteconnect import KiteConnect
         kite = KiteConnect(api_key=API_CREDENTIALS['api_key'])
         kite.set_access_token(API_CREDENTIALS['access_token'])
         logger.info("Kite Connect initialized successfully")
 
-        # Core components
-        safeguards = TradingSafeguards(kite)
-        journal = TradeJournal(logger)
-        position_tracker = PositionTracker(kite)
-        hedge_manager = HedgeManager(kite, position_tracker)
-        order_manager = OrderManager(kite, safeguards, journal)
-        
-        # Main trading manager
-        trade_manager = TradeManager(
-            kite=kite,
-            position_tracker=position_tracker,
-            hedge_manager=hedge_manager,
-            order_manager=order_manager,
-            safeguards=safeguards,
-            journal=journal,
-            logger=logger
-        )
+        # Warm instruments, holidays, margins, positions and orders concurrently
+        startup = StartupSequencer(kite, logger).warm()
+
+        with startup.phase('components'):
+            from core.trade_manager import TradeManager
+            from core.position_tracker import PositionTracker
+            from core.hedge_manager import HedgeManager
+            from core.expiry_manager import ExpiryManager
+            from core.order_manager import OrderManager
+            from core.order_slicer import OrderSlicer
+            from core.safeguards import TradingSafeguards
+            from core.stress_engine import StressEngine
+            from core.trade_journal import TradeJournal
+
+            # Core components
+            stress_engine = StressEngine(kite, startup.lookup_instrument,
+                                         margin_loader=lambda: startup.take(
+                                             'margins', kite.margins, max_age=STARTUP_READY_TIMEOUT),
+                                         working_orders=lambda: order_slicer.working_legs())
+            safeguards = TradingSafeguards(kite, instrument_lookup=startup.lookup_instrument,
+                                           stress_engine=stress_engine)
+            journal = TradeJournal(logger)
+            position_tracker = PositionTracker(kite, instrument_lookup=startup.lookup_instrument)
+            expiry_manager = ExpiryManager(kite, holiday_loader=lambda: startup.get('holidays'))
+            order_slicer = OrderSlicer(kite, safeguards)
+            hedge_manager = HedgeManager(kite, position_tracker, order_slicer,
+                                         expiry_manager=expiry_manager, safeguards=safeguards)
+            order_manager = OrderManager(kite, safeguards, journal,
+                                         instrument_lookup=startup.lookup_instrument,
+                                         order_slicer=order_slicer)
+
+            # Main trading manager
+            trade_manager = TradeManager(
+                kite=kite,
+                position_tracker=position_tracker,
+                hedge_manager=hedge_manager,
+                order_manager=order_manager,
+                safeguards=safeguards,
+                journal=journal,
+                logger=logger
+            )
+
+        # Readiness gate: seed from the warmed snapshot if it arrives in time,
+        # otherwise the first loop cycle refreshes positions live
+        if not startup.wait_until_ready(STARTUP_READY_TIMEOUT):
+            logger.warning("Warm-up not ready, first cycle will refresh positions live")
+        elif startup.failed(*startup.required):
+            logger.warning(f"Warm-up failed for {startup.failed(*startup.required)}, "
+                           "first cycle will refresh positions live")
+        else:
+            try:
+                with startup.phase('seed_positions'):
+                    position_tracker.refresh_positions(
+                        positions=startup.get('positions'),
+                        orders=startup.get('orders')
+                    )
+                startup.seeded = True
+            except Exception as e:
+                logger.warning(f"Seeding positions failed, first cycle will refresh live: {str(e)}")
+        startup.report()
         
-        return trade_manager
+        return trade_manager, startup
 
     except Exception as e:
         logger.critical(f"Initialization failed: {str(e)}", exc_info=True)
@@ -51,14 +94,22 @@ def main():
     
     try:
         # Initialize
-        trade_manager = initialize_components()
+        trade_manager, startup = initialize_components()
+        warm_start = startup.seeded
         
         # Main trading loop
         while True:
             try:
-                # 1. Refresh all positions
-                trade_manager.position_tracker.refresh_positions()
-                logger.debug("Positions refreshed")
+                # 1. Refresh all positions (skipped if seeded at startup). The
+                # orderbook is fetched once and shared by every step this cycle;
+                # orders placed below show up in the next cycle's fetch.
+                if warm_start:
+                    orders = startup.get('orders')
+                else:
+                    orders = trade_manager.kite.orders()
+                    trade_manager.position_tracker.refresh_positions(orders=orders)
+                    logger.debug("Positions refreshed")
+                warm_start = False
                 
                 # 2. Check for existing straddle
                 if not trade_manager.has_active_straddle():
@@ -73,6 +124,14 @@ def main():
                     logger.info(f"Managing profitable leg: {leg['symbol']}")
                     trade_manager.manage_profitable_leg(leg)
                 
+                # 3a. Track sliced order fills and re-price resting children
+                for sliced in trade_manager.order_manager.slicer.poll(orders):
+                    logger.info(f"Sliced {sliced.transaction_type} {sliced.symbol} done: "
+                                f"{sliced.filled_quantity}/{sliced.quantity} @ VWAP {sliced.vwap:.2f}")
+                
+                # 3b. Journal order placements and fills for latency/slippage analysis
+                trade_manager.order_manager.sync_fills(orders)
+                
                 # 4. Maintain hedges
                 trade_manager.maintain_hedges()
                 
@@ -104,6 +163,8 @@ def main():
     finally:
         logger.info("=== Trading System Stopped ===")
         if 'trade_manager' in locals():
+            startup.shutdown()
+            trade_manager.order_manager.slicer.shutdown()
             trade_manager.cleanup()
 
 if __name__ == "__main__":
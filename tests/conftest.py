@@ -0,0 +1,19 @@
+import os
+import sys
+import types
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# config/settings.py holds credentials and is kept out of the repo; give the
+# unit tests a minimal TRADE_CONFIG when it is not present.
+try:
+    import config.settings  # noqa: F401
+except ImportError:
+    settings = types.ModuleType('config.settings')
+    settings.TRADE_CONFIG = {'product_type': 'NRML', 'lot_size': 75}
+    settings.API_CREDENTIALS = {}
+    package = types.ModuleType('config')
+    package.settings = settings
+    sys.modules['config'] = package
+    sys.modules['config.settings'] = settings
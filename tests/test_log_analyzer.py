@@ -0,0 +1,94 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from utils.log_analyzer import (LatencyHistogram, SlippageStats, error_timeline,
+                                join_fills, main, order_events)
+
+T0 = datetime(2025, 4, 15, 9, 15, 0)
+
+
+def _row(order_id, status, seconds, price, side='SELL', quantity=75):
+    return {'order_id': order_id, 'status': status, 'symbol': 'NIFTY25APR24000CE',
+            'type': side, 'quantity': str(quantity), 'price': str(price),
+            'timestamp': (T0 + timedelta(seconds=seconds)).isoformat()}
+
+
+def _record(minute_offset, level='INFO'):
+    return {'timestamp': T0 + timedelta(minutes=minute_offset), 'levelname': level}
+
+
+def test_join_fills_matches_by_order_id_and_drops_unmatched():
+    rows = [
+        _row('1', 'PENDING', 0, 100.0),
+        _row('2', 'PENDING', 1, 50.0),
+        _row('9', 'COMPLETE', 1.5, 10.0),   # placed before this journal began
+        _row('2', 'COMPLETE', 1.25, 49.0),
+        _row('1', 'COMPLETE', 0.5, 100.5),
+    ]
+    fills = list(join_fills(order_events(rows)))
+    assert [f['order_id'] for f in fills] == ['2', '1']
+    assert fills[0]['latency_ms'] == pytest.approx(250)
+    assert fills[1]['latency_ms'] == pytest.approx(500)
+
+
+def test_join_fills_evicts_oldest_open_orders():
+    rows = [_row(str(i), 'PENDING', i, 100.0) for i in range(3)]
+    rows += [_row(str(i), 'COMPLETE', 10, 100.0) for i in range(3)]
+    fills = list(join_fills(order_events(rows), max_open=2))
+    assert [f['order_id'] for f in fills] == ['1', '2']
+
+
+def test_order_events_counts_bad_timestamps():
+    skipped = {'bad_timestamp': 0}
+    rows = [dict(_row('1', 'PENDING', 0, 100.0), timestamp='not a time')]
+    assert list(order_events(rows, skipped)) == []
+    assert skipped['bad_timestamp'] == 1
+
+
+def test_percentile_is_bucket_bound_capped_at_max():
+    latency = LatencyHistogram()
+    for ms in [5] * 90 + [200] * 9 + [700]:
+        latency.add(ms)
+    assert latency.percentile(50) == 10
+    assert latency.percentile(95) == 250
+    assert latency.percentile(100) == 700
+    assert LatencyHistogram().percentile(99) == 0.0
+
+
+def test_slippage_is_signed_adverse_and_quantity_weighted():
+    stats = SlippageStats()
+    stats.add({'symbol': 'A', 'side': 'SELL', 'quantity': 75,
+               'limit_price': 100.0, 'fill_price': 98.0})
+    stats.add({'symbol': 'A', 'side': 'SELL', 'quantity': 225,
+               'limit_price': 100.0, 'fill_price': 101.0})
+    stats.add({'symbol': 'B', 'side': 'BUY', 'quantity': 75,
+               'limit_price': 10.0, 'fill_price': 10.5})
+    summary = {s: (fills, avg, worst) for s, fills, avg, worst in stats.summary()}
+    assert summary['A'] == (2, pytest.approx((2 * 75 - 225) / 300), 2.0)
+    assert summary['B'] == (1, pytest.approx(0.5), 0.5)
+
+
+def test_error_timeline_buckets_intervals_over_an_hour():
+    # 09:15 .. 11:45; 120-minute buckets start at 08:00 and 10:00
+    records = [_record(m, 'ERROR' if m == 60 else 'INFO') for m in range(0, 151, 30)]
+    timeline = list(error_timeline(records, interval_minutes=120))
+    assert timeline == [
+        (T0.replace(hour=8, minute=0), 2, 0),
+        (T0.replace(hour=10, minute=0), 4, 1),
+    ]
+
+
+def test_error_timeline_sub_hour_buckets():
+    records = [_record(0), _record(14, 'ERROR'), _record(15, 'CRITICAL')]
+    timeline = list(error_timeline(records, interval_minutes=15))
+    assert timeline == [
+        (T0, 2, 1),
+        (T0.replace(minute=30), 1, 1),
+    ]
+
+
+@pytest.mark.parametrize('interval', ['0', '-5'])
+def test_cli_rejects_non_positive_interval(interval):
+    with pytest.raises(SystemExit):
+        main(['--interval', interval])
@@ -0,0 +1,151 @@
+import logging
+from datetime import datetime, timedelta
+
+import pytest
+
+from core.order_manager import OrderManager
+from core.trade_journal import TradeJournal
+from utils.log_analyzer import analyze_journal
+
+PLACED = datetime(2025, 4, 15, 9, 15, 0)
+FILLED = PLACED + timedelta(milliseconds=420)
+
+
+class FakeKite:
+    """Orderbook as Kite reports it once a marketable limit has filled"""
+
+    def __init__(self, history_fails=False):
+        self.history_fails = history_fails
+
+    def orders(self):
+        return [{
+            'order_id': '101',
+            'status': 'COMPLETE',
+            'average_price': 99.5,
+            'filled_quantity': 75,
+            # Latest state change, i.e. completion, not placement
+            'order_timestamp': FILLED + timedelta(milliseconds=30),
+            'exchange_timestamp': FILLED,
+        }]
+
+    def order_history(self, order_id):
+        if self.history_fails:
+            raise IOError("history unavailable")
+        return [
+            {'status': 'PUT ORDER REQ RECEIVED', 'order_timestamp': PLACED},
+            {'status': 'OPEN', 'order_timestamp': PLACED + timedelta(milliseconds=60)},
+            {'status': 'COMPLETE', 'order_timestamp': FILLED + timedelta(milliseconds=30)},
+        ]
+
+
+@pytest.fixture
+def journal(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'logs').mkdir()
+    return TradeJournal(logging.getLogger('test_order_manager'))
+
+
+def _manager(kite, journal):
+    manager = OrderManager(kite, safeguards=None, journal=journal, order_slicer=object())
+    manager.pending_orders['101'] = {
+        'symbol': 'NIFTY25APR24000CE', 'quantity': 75, 'price': 95.0,
+        'type': 'SELL', 'journaled': False, 'timestamp': PLACED,
+    }
+    return manager
+
+
+def test_latency_uses_placement_from_order_history(journal):
+    manager = _manager(FakeKite(), journal)
+    assert manager.sync_fills() == 1
+
+    latency, slippage, skipped = analyze_journal(journal.journal_file)
+    assert latency.total == 1
+    assert latency.mean == pytest.approx(420)
+    assert not skipped
+    [(symbol, fills, avg, worst)] = list(slippage.summary())
+    assert symbol == 'NIFTY25APR24000CE'
+    assert avg == pytest.approx(-4.5)  # filled 4.5 above a 95.0 sell limit
+
+
+def test_fill_waits_when_placement_time_unknown(journal):
+    manager = _manager(FakeKite(history_fails=True), journal)
+    assert manager.sync_fills() == 0
+    assert '101' in manager.pending_orders
+
+    latency, _, _ = analyze_journal(journal.journal_file)
+    assert latency.total == 0
+
+
+class FakeSafeguards:
+    def __init__(self):
+        self.errors = 0
+
+    def pre_trade_checks(self, symbol, quantity, transaction_type=None):
+        return True
+
+    def reserve_orders(self, count=1):
+        pass
+
+    def record_error(self):
+        self.errors += 1
+
+
+class PlacingKite:
+    VARIETY_REGULAR = 'regular'
+    ORDER_TYPE_LIMIT = 'LIMIT'
+
+    def __init__(self, failures=0, reject_quantity=None):
+        self.failures = failures
+        self.reject_quantity = reject_quantity
+        self.placed = 0
+
+    def ltp(self, key):
+        return {key: {'last_price': 100.0}}
+
+    def place_order(self, **params):
+        if self.failures or params['quantity'] == self.reject_quantity:
+            self.failures = max(0, self.failures - 1)
+            raise Exception("Order rejected by RMS")
+        self.placed += 1
+        return str(self.placed)
+
+
+@pytest.fixture
+def placing():
+    from core.order_slicer import OrderSlicer
+
+    def make(failures=0, reject_quantity=None):
+        kite, safeguards = PlacingKite(failures, reject_quantity), FakeSafeguards()
+        slicer = OrderSlicer(kite, safeguards, freeze_quantity=1800)
+        lookup = lambda symbol: {'tradingsymbol': symbol, 'lot_size': 75}
+        manager = OrderManager(kite, safeguards, instrument_lookup=lookup, order_slicer=slicer)
+        made.append(slicer)
+        return manager, safeguards
+
+    made = []
+    yield make
+    for slicer in made:
+        slicer.shutdown()
+
+
+def test_sell_order_always_returns_sliced_order(placing):
+    manager, safeguards = placing(failures=0)
+    sliced = manager.place_sell_order('NIFTY25APR24000CE', 75)
+    assert sliced.order_ids == ['1']
+    assert set(manager.pending_orders) == {'1'}
+    assert safeguards.errors == 0
+
+
+def test_partial_sell_order_records_error(placing):
+    manager, safeguards = placing(reject_quantity=1275)
+    sliced = manager.place_sell_order('NIFTY25APR24000CE', 3675)
+    assert sliced.rejected_quantity == 1275
+    assert len(manager.pending_orders) == 2
+    assert safeguards.errors == 1
+
+
+def test_unplaced_sell_order_returns_none(placing):
+    manager, safeguards = placing(failures=2)
+    assert manager.place_sell_order('NIFTY25APR24000CE', 75) is None
+    assert manager.pending_orders == {}
+    assert safeguards.errors == 1
@@ -0,0 +1,124 @@
+import pytest
+
+from core.order_slicer import OrderSlicer, SlicedOrder
+
+
+class FakeKite:
+    VARIETY_REGULAR = 'regular'
+    ORDER_TYPE_LIMIT = 'LIMIT'
+
+    def __init__(self, bid=99.0, ask=101.0, failures=0, reject_quantity=None):
+        self.placed = []
+        self.failures = failures
+        self.reject_quantity = reject_quantity
+        self.depth = {'buy': [{'price': bid}], 'sell': [{'price': ask}]}
+
+    def place_order(self, **params):
+        if self.failures or params['quantity'] == self.reject_quantity:
+            self.failures = max(0, self.failures - 1)
+            raise Exception("Order rejected by RMS")
+        self.placed.append(params)
+        return str(len(self.placed))
+
+    def quote(self, key):
+        return {key: {'last_price': 100.0, 'depth': self.depth}}
+
+
+@pytest.fixture
+def slicer():
+    s = OrderSlicer(FakeKite(), freeze_quantity=1800)
+    yield s
+    s.shutdown()
+
+
+def test_slice_under_freeze_is_single_order(slicer):
+    assert slicer.slice_quantity(1800, 75) == [1800]
+    assert slicer.slice_quantity(75, 75) == [75]
+
+
+def test_slice_splits_evenly_in_lot_multiples(slicer):
+    children = slicer.slice_quantity(5400, 75)
+    assert children == [1800, 1800, 1800]
+
+    children = slicer.slice_quantity(3825, 75)  # 51 lots
+    assert sum(children) == 3825
+    assert all(q % 75 == 0 and q <= 1800 for q in children)
+    assert len(children) == 3
+    assert max(children) - min(children) <= 75
+
+
+def test_slice_rejects_non_lot_quantity(slicer):
+    with pytest.raises(Exception, match="not multiple of lot size"):
+        slicer.slice_quantity(100, 75)
+
+
+def test_vwap_weights_by_filled_quantity():
+    sliced = SlicedOrder('NIFTY', 'SELL', 3000, 100.0)
+    sliced.children = [
+        {'filled_quantity': 1800, 'average_price': 100.0, 'status': 'COMPLETE'},
+        {'filled_quantity': 1200, 'average_price': 105.0, 'status': 'COMPLETE'},
+    ]
+    assert sliced.filled_quantity == 3000
+    assert sliced.vwap == pytest.approx((1800 * 100.0 + 1200 * 105.0) / 3000)
+    assert sliced.done
+
+
+def test_vwap_of_unfilled_order_is_zero():
+    sliced = SlicedOrder('NIFTY', 'BUY', 1800, 10.0)
+    sliced.children = [{'filled_quantity': 0, 'average_price': 0.0, 'status': 'OPEN'}]
+    assert sliced.vwap == 0.0
+    assert not sliced.done
+
+
+def test_submit_places_every_child_and_registers_for_poll(slicer):
+    sliced = slicer.submit('NIFTY', 'SELL', 3600, 75, 95.0)
+    assert [p['quantity'] for p in slicer.kite.placed] == [1800, 1800]
+    assert len(sliced.order_ids) == 2
+    assert slicer.active == [sliced]
+
+
+def test_reprice_is_bounded_around_original_limit(slicer):
+    slicer.kite.depth = {'buy': [{'price': 50.0}], 'sell': [{'price': 200.0}]}
+    buy = SlicedOrder('NIFTY', 'BUY', 1800, 100.0)
+    sell = SlicedOrder('NIFTY', 'SELL', 1800, 100.0)
+    assert slicer._quote_price(buy) == pytest.approx(105.0)
+    assert slicer._quote_price(sell) == pytest.approx(95.0)
+
+
+def test_submit_within_freeze_is_one_child(slicer):
+    sliced = slicer.submit('NIFTY', 'BUY', 150, 75, 10.0)
+    assert len(sliced.children) == 1
+    assert sliced.order_ids == ['1']
+
+
+def test_submit_retries_rejected_children_once(slicer):
+    slicer.kite.failures = 1
+    sliced = slicer.submit('NIFTY', 'SELL', 3600, 75, 95.0)
+    assert len(sliced.order_ids) == 2
+    assert sliced.rejected_quantity == 0
+
+
+def test_submit_reports_quantity_still_rejected_after_retry(slicer):
+    slicer.kite.reject_quantity = 1275  # 49 lots -> 1275 + 1200 + 1200
+    sliced = slicer.submit('NIFTY', 'SELL', 3675, 75, 95.0)
+    assert len(sliced.order_ids) == 2
+    assert sliced.rejected_quantity == 1275
+    assert slicer.active == [sliced]
+
+
+def test_poll_uses_the_orderbook_it_is_given(slicer):
+    sliced = slicer.submit('NIFTY', 'SELL', 3600, 75, 95.0)
+    orders = [{'order_id': oid, 'status': 'COMPLETE', 'filled_quantity': 1800,
+               'average_price': 96.0} for oid in sliced.order_ids]
+    # FakeKite has no orders(); a fetch here would raise
+    assert slicer.poll(orders) == [sliced]
+    assert sliced.vwap == pytest.approx(96.0)
+    assert slicer.active == []
+
+
+def test_working_legs_net_unfilled_children_by_symbol(slicer):
+    sell = slicer.submit('NIFTY24000CE', 'SELL', 3600, 75, 95.0)
+    slicer.submit('NIFTY24000CE', 'BUY', 75, 75, 5.0)
+    sell.children[0].update(status='COMPLETE', filled_quantity=1800)
+    sell.children[1].update(filled_quantity=300)
+    assert slicer.working_legs() == [('NIFTY24000CE', -1500 + 75)]
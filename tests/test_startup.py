@@ -0,0 +1,108 @@
+import logging
+import threading
+import time
+
+import pytest
+
+from core.startup import StartupSequencer
+
+
+class FakeKite:
+    def __init__(self, fail=(), block=()):
+        self.fail = set(fail)
+        self.release = threading.Event()
+        self.block = set(block)
+        self.margin_calls = 0
+
+    def _call(self, name, value):
+        if name in self.block:
+            self.release.wait(5)
+        if name in self.fail:
+            raise IOError(f"{name} unavailable")
+        return value
+
+    def positions(self):
+        return self._call('positions', {'net': [{'tradingsymbol': 'NIFTYX'}]})
+
+    def orders(self):
+        return self._call('orders', [])
+
+    def margins(self):
+        self.margin_calls += 1
+        return self._call('margins', {'call': self.margin_calls})
+
+    def holidays(self):
+        return self._call('holidays', {'NFO': []})
+
+    def instruments(self, exchange):
+        return self._call('instruments', [{'tradingsymbol': 'NIFTYX', 'lot_size': 75}])
+
+
+@pytest.fixture
+def make_startup():
+    started = []
+
+    def make(kite):
+        startup = StartupSequencer(kite, logging.getLogger('test_startup')).warm()
+        started.append((kite, startup))
+        return startup
+
+    yield make
+    for kite, startup in started:
+        kite.release.set()
+        startup.shutdown()
+
+
+def test_ready_once_required_tasks_finish(make_startup):
+    kite = FakeKite()
+    startup = make_startup(kite)
+    assert startup.wait_until_ready(2)
+    assert startup.failed(*startup.required) == []
+    assert startup.get('positions') == [{'tradingsymbol': 'NIFTYX'}]
+    assert startup.lookup_instrument('NIFTYX')['lot_size'] == 75
+    assert 'ready' in startup.report()
+
+
+def test_failed_required_task_is_reported_not_raised(make_startup):
+    kite = FakeKite(fail=['positions'])
+    startup = make_startup(kite)
+    assert startup.wait_until_ready(2)
+    assert startup.failed(*startup.required) == ['positions']
+    with pytest.raises(IOError):
+        startup.get('positions')
+
+
+def test_timeout_when_required_task_hangs(make_startup):
+    kite = FakeKite(block=['orders'])
+    startup = make_startup(kite)
+    start = time.monotonic()
+    assert not startup.wait_until_ready(0.2)
+    assert time.monotonic() - start < 1
+    assert 'orders' in startup.pending()
+
+
+def test_take_serves_warm_result_once_then_falls_back(make_startup):
+    kite = FakeKite()
+    startup = make_startup(kite)
+    startup.wait_until_ready(2)
+    startup.get('margins')
+    assert startup.take('margins', kite.margins, max_age=60) == {'call': 1}
+    assert startup.take('margins', kite.margins, max_age=60) == {'call': 2}
+
+
+def test_take_ignores_stale_warm_result(make_startup):
+    kite = FakeKite()
+    startup = make_startup(kite)
+    startup.get('margins')
+    startup.completed_at['margins'] -= 10
+    assert startup.take('margins', kite.margins, max_age=2) == {'call': 2}
+
+
+def test_take_falls_back_when_warm_up_failed(make_startup):
+    kite = FakeKite(fail=['margins'])
+    startup = make_startup(kite)
+    startup.wait_until_ready(2)
+    while startup.pending():
+        time.sleep(0.01)
+    kite.fail.clear()
+    assert startup.take('margins', kite.margins, max_age=60) == {'call': 2}
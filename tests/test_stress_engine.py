@@ -0,0 +1,150 @@
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from core.safeguards import TRADE_CONFIG, TradingSafeguards
+from core.stress_engine import StressEngine, black_scholes, implied_vol
+
+
+def test_black_scholes_matches_reference_values():
+    # Hull: S=K=100, T=1, r=5%, vol=20% -> call 10.4506, put 5.5735
+    assert black_scholes(100.0, 100.0, 1.0, 0.2, 0.05, True) == pytest.approx(10.4506, abs=1e-3)
+    assert black_scholes(100.0, 100.0, 1.0, 0.2, 0.05, False) == pytest.approx(5.5735, abs=1e-3)
+
+
+def test_black_scholes_at_expiry_is_intrinsic():
+    assert black_scholes(110.0, 100.0, 0.0, 0.2, 0.05, True) == pytest.approx(10.0)
+    assert black_scholes(110.0, 100.0, 0.0, 0.2, 0.05, False) == pytest.approx(0.0)
+
+
+def test_implied_vol_round_trip():
+    strike = np.array([22000.0, 23500.0, 24000.0, 24500.0, 26000.0])
+    is_call = np.array([False, False, True, True, True])
+    vol = np.array([0.22, 0.17, 0.14, 0.13, 0.16])
+    t = 20 / 365
+    prices = black_scholes(24000.0, strike, t, vol, 0.065, is_call)
+
+    recovered = implied_vol(prices, 24000.0, strike, t, 0.065, is_call)
+    np.testing.assert_allclose(recovered, vol, atol=1e-4)
+
+
+class FakeKite:
+    VARIETY_REGULAR = 'regular'
+    ORDER_TYPE_MARKET = 'MARKET'
+
+    def __init__(self, positions, prices, spot=24000.0, used=100000.0, available=400000.0):
+        self._positions = positions
+        self.prices = prices
+        self.spot = spot
+        self.equity = {'used': used, 'available': available}
+        self.calls = 0
+
+    def positions(self):
+        self.calls += 1
+        return {'net': self._positions}
+
+    def ltp(self, keys):
+        # Like Kite, unknown instruments are simply absent from the response
+        quotes = {k: {'last_price': self.prices[k[4:]]} for k in keys if k[4:] in self.prices}
+        quotes['NSE:NIFTY 50'] = {'last_price': self.spot}
+        return quotes
+
+    def margins(self):
+        return {'equity': dict(self.equity)}
+
+    def order_margins(self, params):
+        return [{'total': 50000.0 * abs(p['quantity']) / 75} for p in params]
+
+
+EXPIRY = date.today() + timedelta(days=20)
+INSTRUMENTS = {
+    'NIFTY24000CE': {'instrument_type': 'CE', 'strike': 24000, 'expiry': EXPIRY},
+    'NIFTY24000PE': {'instrument_type': 'PE', 'strike': 24000, 'expiry': EXPIRY},
+}
+
+
+@pytest.fixture
+def straddle_engine():
+    instruments = INSTRUMENTS
+    positions = [{'tradingsymbol': s, 'quantity': -75, 'exchange': 'NFO'} for s in instruments]
+    kite = FakeKite(positions, {'NIFTY24000CE': 300.0, 'NIFTY24000PE': 280.0})
+    return StressEngine(kite, instruments.get)
+
+
+def test_revalue_shape_and_zero_shock_pnl(straddle_engine):
+    engine = straddle_engine
+    book = engine.build_book()
+    pnl = engine.revalue(book)
+
+    assert pnl.shape == (engine.days_forward.size, engine.vol_shocks.size, engine.spot_moves.size)
+    d = int(np.argmin(np.abs(engine.days_forward)))
+    v = int(np.argmin(np.abs(engine.vol_shocks)))
+    s = int(np.argmin(np.abs(engine.spot_moves)))
+    assert pnl[d, v, s] == pytest.approx(0.0, abs=1e-3)
+
+
+def test_short_straddle_loses_on_large_moves(straddle_engine):
+    report = straddle_engine.run()
+    assert report['worst_loss'] > 0
+    assert abs(report['worst_scenario']['spot_move']) == pytest.approx(straddle_engine.spot_moves.max())
+    assert report['worst_scenario']['vol_shock'] == pytest.approx(straddle_engine.vol_shocks.max())
+
+
+def test_margin_at_risk_includes_proposed_order_margin(straddle_engine):
+    report = straddle_engine.run(extra_legs=[('NIFTY24000CE', -75)])
+    expected = (100000.0 + 50000.0 + report['worst_loss']) / 500000.0
+    assert report['order_margin'] == 50000.0
+    assert report['margin_at_risk'] == pytest.approx(expected)
+
+
+def test_unknown_proposed_leg_raises(straddle_engine):
+    with pytest.raises(Exception, match="Cannot stress proposed leg"):
+        straddle_engine.run(extra_legs=[('NOSUCHSYMBOL', -75)])
+
+
+def test_existing_leg_without_quote_uses_position_price():
+    positions = [{'tradingsymbol': 'NIFTY24000CE', 'quantity': -75,
+                  'exchange': 'NFO', 'last_price': 300.0}]
+    engine = StressEngine(FakeKite(positions, {}), INSTRUMENTS.get)
+    book = engine.build_book()
+    assert book['price'].tolist() == [300.0]
+
+    with pytest.raises(Exception, match="no price available"):
+        engine.build_book(extra_legs=[('NIFTY24000PE', -75)])
+
+
+@pytest.fixture
+def gate(monkeypatch):
+    """Safeguards over an empty book with 5L of capital"""
+    monkeypatch.setitem(TRADE_CONFIG, 'max_margin_at_risk', TradingSafeguards.MAX_MARGIN_AT_RISK)
+    kite = FakeKite([], {'NIFTY24000CE': 300.0, 'NIFTY24000PE': 280.0},
+                    used=0.0, available=500000.0)
+    return TradingSafeguards(kite, stress_engine=StressEngine(kite, INSTRUMENTS.get))
+
+
+def test_default_limit_passes_one_lot_and_blocks_four(gate):
+    gate.check_stress('NIFTY24000CE', 75, 'SELL')
+    assert gate.last_stress['margin_at_risk'] < 1.0
+
+    with pytest.raises(Exception, match="Margin at risk"):
+        gate.check_stress('NIFTY24000CE', 300, 'SELL')
+
+
+def test_check_skips_broker_calls_when_limits_disabled(gate, monkeypatch):
+    monkeypatch.setitem(TRADE_CONFIG, 'max_margin_at_risk', None)
+    gate.check_stress('NIFTY24000CE', 3000, 'SELL')
+    assert gate.stress_engine.kite.calls == 0
+    assert gate.last_stress is None
+
+
+def test_working_orders_join_the_book(gate):
+    # First straddle leg still working when the second is checked
+    engine = gate.stress_engine
+    engine.working_orders = lambda: [('NIFTY24000CE', -150)]
+    book = engine.build_book(extra_legs=[('NIFTY24000PE', -150)])
+    assert book['qty'].tolist() == [-150, -150]
+    assert book['is_call'].tolist() == [True, False]
+
+    gate.check_stress('NIFTY24000PE', 150, 'SELL')
+    np.testing.assert_allclose(gate.last_stress['pnl'], engine.revalue(book), atol=0.01)
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""Streaming analysis of trading logs and order journals.
+
+Every stage is a generator, so months of rotated (and gzipped) history are
+processed one line at a time. Only orders still awaiting a fill and the
+aggregate counters are held in memory.
+
+Usage:
+    python -m utils.log_analyzer --log logs/trading_system.log \\
+        --journal logs/trade_journal.csv --interval 15
+"""
+import argparse
+import bisect
+import csv
+import glob
+import gzip
+import os
+import re
+from collections import Counter, OrderedDict, defaultdict
+from datetime import datetime
+
+LOG_PATTERN = re.compile(
+    r'^(?P<asctime>\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3}) - '
+    r'(?P<name>\S+) - (?P<levelname>[A-Z]+) - (?P<message>.*)$'
+)
+ERROR_LEVELS = ('ERROR', 'CRITICAL')
+PLACED_STATUSES = ('PENDING', 'OPEN')
+FILLED_STATUSES = ('COMPLETE',)
+
+# Latency histogram bucket upper bounds in milliseconds
+LATENCY_BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000,
+                      10000, 30000, 60000, 300000, float('inf'))
+
+
+def rotated_files(base_path):
+    """Current file plus its rotated backups, oldest first"""
+    backups = [p for p in glob.glob(f"{glob.escape(base_path)}.*")
+               if p != base_path]
+    files = sorted(backups)
+    if os.path.exists(base_path):
+        files.append(base_path)
+    return files
+
+
+def _open(path):
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', newline='')
+    return open(path, 'r', newline='')
+
+
+def read_lines(paths):
+    """Yield lines across files without loading any of them whole"""
+    for path in paths:
+        with _open(path) as f:
+            for line in f:
+                yield line.rstrip('\r\n')
+
+
+def parse_log_records(lines):
+    """Yield structured records from `configure_logger` formatted lines"""
+    record = None
+    for line in lines:
+        match = LOG_PATTERN.match(line)
+        if match:
+            if record:
+                yield record
+            record = match.groupdict()
+            record['timestamp'] = datetime.strptime(record.pop('asctime'),
+                                                    '%Y-%m-%d %H:%M:%S,%f')
+        elif record:
+            # Traceback or other continuation of the previous record
+            record['message'] += '\n' + line
+    if record:
+        yield record
+
+
+def read_journal_rows(paths):
+    """Yield trade journal rows as dicts, honouring each file's header"""
+    for path in paths:
+        with _open(path) as f:
+            for row in csv.DictReader(f):
+                yield row
+
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def order_events(rows, skipped=None):
+    """Normalise journal rows into placed/filled order events.
+
+    Malformed rows are skipped and tallied in the optional `skipped` Counter
+    rather than aborting a long run.
+    """
+    for row in rows:
+        order_id = row.get('order_id')
+        if not order_id or order_id == 'N/A':
+            continue
+        status = (row.get('status') or '').upper()
+        if status in PLACED_STATUSES:
+            kind = 'placed'
+        elif status in FILLED_STATUSES:
+            kind = 'filled'
+        else:
+            continue
+        try:
+            timestamp = datetime.fromisoformat(row['timestamp'])
+        except (TypeError, ValueError):
+            if skipped is not None:
+                skipped['bad_timestamp'] += 1
+            continue
+        yield {
+            'kind': kind,
+            'order_id': order_id,
+            'timestamp': timestamp,
+            'symbol': row.get('symbol', 'N/A'),
+            'side': (row.get('type') or '').upper(),
+            'quantity': _to_float(row.get('quantity')),
+            'price': _to_float(row.get('price')),
+        }
+
+
+def join_fills(events, max_open=10000):
+    """Match fills to their placement by order_id.
+
+    Unmatched placements are kept in insertion order and the oldest are
+    evicted once `max_open` is exceeded, which bounds memory on long runs.
+    """
+    open_orders = OrderedDict()
+    for event in events:
+        if event['kind'] == 'placed':
+            open_orders[event['order_id']] = event
+            if len(open_orders) > max_open:
+                open_orders.popitem(last=False)
+            continue
+
+        placed = open_orders.pop(event['order_id'], None)
+        if placed is None:
+            continue
+        yield {
+            'order_id': event['order_id'],
+            'symbol': placed['symbol'],
+            'side': placed['side'] or event['side'],
+            'quantity': event['quantity'] or placed['quantity'],
+            'limit_price': placed['price'],
+            'fill_price': event['price'],
+            'latency_ms': (event['timestamp'] - placed['timestamp']).total_seconds() * 1000,
+        }
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency distribution with approximate percentiles"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS_MS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def add(self, latency_ms):
+        self.counts[bisect.bisect_left(self.buckets, latency_ms)] += 1
+        self.total += 1
+        self.sum_ms += latency_ms
+        self.max_ms = max(self.max_ms, latency_ms)
+
+    def percentile(self, pct):
+        """Upper bound of the bucket containing the given percentile"""
+        if not self.total:
+            return 0.0
+        threshold = self.total * pct / 100
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= threshold:
+                return min(bound, self.max_ms)
+        return self.max_ms
+
+    @property
+    def mean(self):
+        return self.sum_ms / self.total if self.total else 0.0
+
+
+class SlippageStats:
+    """Per-symbol slippage of fills against the order's limit price.
+
+    Positive values are adverse: a SELL filled below its limit or a BUY
+    filled above it.
+    """
+
+    def __init__(self):
+        self.by_symbol = defaultdict(lambda: {'fills': 0, 'quantity': 0.0,
+                                              'weighted': 0.0, 'worst': float('-inf')})
+
+    def add(self, fill):
+        if not fill['limit_price'] or not fill['fill_price']:
+            return
+        if fill['side'] == 'BUY':
+            slippage = fill['fill_price'] - fill['limit_price']
+        else:
+            slippage = fill['limit_price'] - fill['fill_price']
+        stats = self.by_symbol[fill['symbol']]
+        stats['fills'] += 1
+        stats['quantity'] += fill['quantity']
+        stats['weighted'] += slippage * fill['quantity']
+        stats['worst'] = max(stats['worst'], slippage)
+
+    def summary(self):
+        for symbol, stats in sorted(self.by_symbol.items()):
+            avg = stats['weighted'] / stats['quantity'] if stats['quantity'] else 0.0
+            yield symbol, stats['fills'], avg, stats['worst']
+
+
+def error_timeline(records, interval_minutes=15):
+    """Yield (bucket_start, total, errors) per interval in log order"""
+    current, total, errors = None, 0, 0
+    for record in records:
+        ts = record['timestamp']
+        # Bucket on minutes since midnight so intervals of an hour or more work
+        minutes = ts.hour * 60 + ts.minute
+        start = minutes - minutes % interval_minutes
+        bucket = ts.replace(hour=start // 60, minute=start % 60, second=0, microsecond=0)
+        if bucket != current:
+            if current is not None:
+                yield current, total, errors
+            current, total, errors = bucket, 0, 0
+        total += 1
+        if record['levelname'] in ERROR_LEVELS:
+            errors += 1
+    if current is not None:
+        yield current, total, errors
+
+
+def analyze_journal(journal_path, max_open=10000):
+    """Latency histogram, slippage stats and skipped-row counts from the journal"""
+    latency = LatencyHistogram()
+    slippage = SlippageStats()
+    skipped = Counter()
+    rows = read_journal_rows(rotated_files(journal_path))
+    for fill in join_fills(order_events(rows, skipped), max_open=max_open):
+        latency.add(fill['latency_ms'])
+        slippage.add(fill)
+    return latency, slippage, skipped
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Latency, slippage and error-rate report")
+    parser.add_argument('--log', default='logs/trading_system.log')
+    parser.add_argument('--journal', default='logs/trade_journal.csv')
+    parser.add_argument('--interval', type=int, default=15,
+                        help="Error-rate bucket size in minutes")
+    parser.add_argument('--max-open', type=int, default=10000,
+                        help="Unfilled orders kept in memory while joining")
+    args = parser.parse_args(argv)
+    if args.interval <= 0:
+        parser.error("--interval must be a positive number of minutes")
+    if args.max_open <= 0:
+        parser.error("--max-open must be positive")
+
+    latency, slippage, skipped = analyze_journal(args.journal, max_open=args.max_open)
+    if skipped:
+        print(f"Skipped malformed journal rows: {dict(skipped)}\n")
+
+    print("=== Order latency (placed -> filled) ===")
+    print(f"Fills: {latency.total}  Mean: {latency.mean:.0f} ms  Max: {latency.max_ms:.0f} ms")
+    for pct in (50, 90, 95, 99):
+        print(f"  p{pct}: <= {latency.percentile(pct):.0f} ms")
+
+    print("\n=== Slippage vs limit price (points, qty-weighted) ===")
+    for symbol, fills, avg, worst in slippage.summary():
+        print(f"  {symbol:<24} fills={fills:<5} avg={avg:+.2f} worst={worst:+.2f}")
+
+    print(f"\n=== Error rate per {args.interval} min ===")
+    records = parse_log_records(read_lines(rotated_files(args.log)))
+    for bucket, total, errors in error_timeline(records, args.interval):
+        if errors:
+            print(f"  {bucket:%Y-%m-%d %H:%M}  {errors}/{total} ({errors / total:.1%})")
+
+
+if __name__ == "__main__":
+    main()